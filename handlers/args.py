@@ -1,58 +1,79 @@
-from gradio.components.base import Component
+import functools
+import json
 import logging
+import threading
+from typing import Mapping, TYPE_CHECKING
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from gradio.components.base import Component
 
 logger = logging.getLogger(__name__)
 
 
 class ArgHandler:
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(ArgHandler, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(ArgHandler, cls).__new__(cls)
+                    instance.args = {}
+                    instance.descriptions = {}
+                    instance.elements = {}  # Dictionary to track registered elements
+                    instance._js_cache = None
+                    cls._instance = instance
         return cls._instance
 
     def __init__(self):
-        if not hasattr(self, "args"):
-            self.args = {}
-        if not hasattr(self, "descriptions"):
-            self.descriptions = {}
-        if not hasattr(self, "elements"):
-            self.elements = {}  # Dictionary to track registered elements
+        # State is set up once in __new__; repeated construction must not reset it
+        pass
+
+    @classmethod
+    def get_instance(cls) -> "ArgHandler":
+        return cls()
 
     def register_description(self, wrapper_name: str, elem_name: str, description: str):
         elem_id = f"{wrapper_name}_{elem_name}"
         self.descriptions[elem_id] = description
+        self._js_cache = None
 
-    def register_element(self, wrapper_name: str, elem_name: str, gradio_element: Component, description: str = None):
-        # Initialize wrapper key in the dictionaries
-        if wrapper_name not in self.args:
-            self.args[wrapper_name] = {}
-        if wrapper_name not in self.elements:
-            self.elements[wrapper_name] = {}
+    def register_descriptions_bulk(self, wrapper_name: str, descriptions: Mapping[str, str]):
+        self.descriptions.update({f"{wrapper_name}_{elem_name}": d for elem_name, d in descriptions.items()})
+        self._js_cache = None
 
-        # Get initial value (if available)
-        element_value = getattr(gradio_element, "value", None)
-        self.args[wrapper_name][elem_name] = element_value
-        self.elements[wrapper_name][elem_name] = gradio_element
+    def register_element(self, wrapper_name: str, elem_name: str, gradio_element: "Component", description: str = None):
+        # Initialize wrapper key in the dictionaries and store the initial value (if available)
+        self.args.setdefault(wrapper_name, {})[elem_name] = getattr(gradio_element, "value", None)
+        # Hold components weakly so torn-down layouts can be garbage collected
+        self.elements.setdefault(wrapper_name, WeakValueDictionary())[elem_name] = gradio_element
 
         # Optionally register description
         if description:
             self.register_description(wrapper_name, elem_name, description)
 
-        # Set listeners for the element
-        for method in ["upload", "change", "clear"]:
-            if hasattr(gradio_element, method):
-                getattr(gradio_element, method)(
-                    lambda value, wn=wrapper_name, en=elem_name: self.update_element(wn, en, value),
-                    inputs=gradio_element,
-                    show_progress="hidden"
-                )
+        # Set listeners for the element, sharing a single handler between them
+        handler = functools.partial(self._dispatch_update, wrapper_name, elem_name)
+        for method in ("upload", "change", "clear"):
+            listener = getattr(gradio_element, method, None)
+            if listener:
+                listener(handler, inputs=gradio_element, show_progress="hidden")
+
+    def _dispatch_update(self, wrapper_name: str, elem_name: str, value):
+        # The element was registered before its listeners, so the keys are known to exist
+        self.args[wrapper_name][elem_name] = value
+        logger.info(f"Updated {wrapper_name}.{elem_name} -> {value}")
 
     def update_element(self, wrapper_name: str, elem_name: str, value):
-        # Dynamically update the dictionary with new values
-        if wrapper_name in self.args and elem_name in self.args[wrapper_name]:
-            self.args[wrapper_name][elem_name] = value
+        # Dynamically update the dictionary with new values, ignoring unknown elements
+        try:
+            wrapper_args = self.args[wrapper_name]
+        except KeyError:
+            return
+        if elem_name in wrapper_args:
+            wrapper_args[elem_name] = value
             logger.info(f"Updated {wrapper_name}.{elem_name} -> {value}")
 
     def get_element(self, wrapper_name: str, elem_name: str):
@@ -63,36 +84,37 @@ class ArgHandler:
         return self.args
 
     def get_descriptions_js(self):
-        return """
+        if self._js_cache is not None:
+            return self._js_cache
+        self._js_cache = """
     console.log("[DEBUG] Script injected...");
     let hintsSet = false;
 
     function setDescriptions() {
-      if (typeof gradioApp === "undefined" || !gradioApp()) {
+      const app = typeof gradioApp !== "undefined" ? gradioApp() : null;
+      if (!app) {
         console.warn("[DEBUG] gradioApp() not defined or returned null.");
         return;
       }
 
-      let hintItems = gradioApp().querySelectorAll(".hintitem");
+      let hintItems = app.querySelectorAll(".hintitem");
       
       if (!hintItems || hintItems.length === 0) {
         console.log("[DEBUG] .hintitem elements not found.");
         return;
       }
 
-      // Build the descriptions object
-      const descriptions = {
-        """ + ", ".join([f'"{k}": "{v}"' for k, v in self.descriptions.items()]) + """
-      };
+      // Build the descriptions map
+      const descriptions = new Map(Object.entries(""" + json.dumps(self.descriptions, ensure_ascii=False) + """));
       console.log("[DEBUG] descriptions:", descriptions);
-      const processorList = gradioApp().querySelector("#processor_list");
+      const processorList = app.querySelector("#processor_list");
       // Get all of the label elements in the processor list
       const processorLabels = processorList.querySelectorAll("label");
         // Go through each label element
         for (let label of processorLabels) {
             // Get the label value
             let labelValue = label.innerText + "_description";
-            let description = descriptions[labelValue];
+            let description = descriptions.get(labelValue);
             if (description) {
                 label.title = description;
             }
@@ -101,21 +123,22 @@ class ArgHandler:
       // Go through each .hintitem
       for (let hintItem of hintItems) {
         let elemId = hintItem.id;
-        let description = descriptions[elemId];
+        let description = descriptions.get(elemId);
         addHintButton(hintItem, description);
         
         if (description) {
           hintItem.title = description;
-          let inputs = hintItem.getElementsByTagName("input");
-          let labels = hintItem.getElementsByTagName("label");
-          for (let input of inputs) {
-            input.title = description;
-          }
-          for (let label of labels) {
-            label.title = description;
-          }
         }
       }
+
+      // Title every input/label in a single pass, keyed by the enclosing .hintitem
+      app.querySelectorAll(".hintitem input, .hintitem label").forEach((el) => {
+        const hintItem = el.closest(".hintitem");
+        const description = hintItem ? descriptions.get(hintItem.id) : undefined;
+        if (description) {
+          el.title = description;
+        }
+      });
     }
 
     function addHintButton(hintItem, description) {
@@ -150,16 +173,29 @@ class ArgHandler:
     function waitForGradioApp() {
       console.log("[DEBUG] Waiting for gradioApp...");
       refresh();
-      const interval = setInterval(() => {
-        if (typeof gradioApp !== "undefined" && gradioApp()) {        
-          console.log("[DEBUG] gradioApp() loaded. Initializing setDescriptions and addHintButton...");
-          setDescriptions();
-          clearInterval(interval);
-          hintsSet = true;
-        } else {
-          console.log("[DEBUG] gradioApp() not ready. Retrying...");
+      if (tryInitDescriptions()) {
+        return;
+      }
+      // Re-check only when nodes are added instead of polling on a timer
+      const observer = new MutationObserver(() => {
+        if (tryInitDescriptions()) {
+          observer.disconnect();
         }
-      }, 1000); // Retry every 1 second
+      });
+      observer.observe(document.body, {childList: true, subtree: true});
+    }
+
+    function tryInitDescriptions() {
+      if (hintsSet) {
+        return true;
+      }
+      if (typeof gradioApp !== "undefined" && gradioApp()) {
+        console.log("[DEBUG] gradioApp() loaded. Initializing setDescriptions and addHintButton...");
+        setDescriptions();
+        hintsSet = true;
+        return true;
+      }
+      return false;
     }
 
     onUiLoaded(function () {        
@@ -174,3 +210,4 @@ class ArgHandler:
       waitForGradioApp();
     }
     """
+        return self._js_cache
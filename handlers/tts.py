@@ -1,14 +1,31 @@
+import functools
+import itertools
 import json
 import logging
 import os
 import time
 
 import torch
-from TTS.api import TTS
 
 from handlers.config import output_path, model_path
 
 logger = logging.getLogger(__name__)
+_tts_cls = None
+
+
+def _get_tts_cls():
+    # Coqui TTS pulls in a large dependency tree, so only import it once the handler is actually used
+    global _tts_cls
+    if _tts_cls is None:
+        from TTS.api import TTS
+        _tts_cls = TTS
+    return _tts_cls
+
+
+@functools.lru_cache(maxsize=1)
+def _models_dict():
+    # The model manifest only depends on the installed TTS package, so scan it once per process
+    return _get_tts_cls()().list_models().models_dict
 
 
 class TTSHandler:
@@ -16,35 +33,40 @@ class TTSHandler:
         self.language = language
         # Get device
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model_dict = TTS().list_models().models_dict
+        self.model_dict = _models_dict()
         self.tts_models = self.model_dict.get("tts_models", {})
         self.tts_languages = [key for key in self.tts_models.keys() if key != "multilingual"]
+        # Model keys never change after init, so build the per-language lists once
+        self._models_by_lang = {
+            lang: [f"{lang}/{model_name}/{sub_model}" for model_name, sub_models in models.items()
+                   for sub_model in sub_models]
+            for lang, models in self.tts_models.items()
+        }
+        self._flat_models = {
+            f"{lang}/{model_name}/{sub_model}": model_data
+            for lang, models in self.tts_models.items()
+            for model_name, sub_models in models.items()
+            for sub_model, model_data in sub_models.items()
+        }
         self.selected_model = None
         self.default_model = "multilingual/xtts_v2"
         self.tts = None
+        self._tts_device = None
+        self._counter = itertools.count()
         self.model_data = {}
 
         # Fetch metadata for the default model
-        self.fetch_model_metadata("multilingual/xtts_v2")
+        self.fetch_model_metadata("multilingual/multi-dataset/xtts_v2")
 
     def fetch_model_metadata(self, model_name):
         full_model_path = "tts_models/" + model_name
-        if "multilingual" in full_model_path:
-            lang = "multilingual"
-        else:
-            lang = self.language
-        try:
-            self.model_data = self.tts_models.get(lang, {}).get(
-                model_name.split("/")[0], {}).get(model_name.split("/")[1], {}
-                                                  )
-        except:
-            self.model_data = {}
+        self.model_data = self._flat_models.get(model_name, {})
         logger.info(f"Fetched metadata for model: {full_model_path}, data: {self.model_data}")
 
     def handle(self, text: str, model_name: str, speaker_wav: str, selected_speaker: str, speed: float = 1.0):
         output_dir = os.path.join(output_path, "tts")
-        # Use timestamp to make the filename unique
-        file_stamp = str(int(time.time()))
+        # Timestamp plus a per-handler counter, so two requests in the same second don't overwrite each other
+        file_stamp = f"{int(time.time())}_{next(self._counter)}"
         output_file = os.path.join(output_dir, f"(TTS)_{file_stamp}.wav")
         os.makedirs(output_dir, exist_ok=True)
         full_model_path = "tts_models/" + model_name
@@ -53,31 +75,26 @@ class TTSHandler:
         self.tts.tts_to_file(text=text, speaker_wav=speaker_wav, file_path=output_file, language=lang, speed=speed,
                              speaker=selected_speaker)
         logger.info(f"Output file: {output_file}")
-        if self.device == "cuda":
+        if self.device == "cuda" and self._tts_device != "cpu":
             self.tts.to("cpu")
+            self._tts_device = "cpu"
             torch.cuda.empty_cache()
         return output_file
 
     def available_models(self):
-        language_models = self.tts_models.get(self.language, {})
-        multilingual_models = self.tts_models.get("multilingual", {})
-        all_model_keys = []
-        for model_name, sub_models in language_models.items():
-            for sub_model, model_data in sub_models.items():
-                all_model_keys.append(self.language + "/" + model_name + "/" + sub_model)
-        for model_name, sub_models in multilingual_models.items():
-            for sub_model, model_data in sub_models.items():
-                all_model_keys.append("multilingual/" + model_name + "/" + sub_model)
-        return all_model_keys
+        by_lang = self._models_by_lang
+        return [*by_lang.get(self.language, ()), *by_lang.get("multilingual", ())]
 
     def load_model(self, model_name):
         full_model_path = "tts_models/" + model_name
         if self.selected_model != full_model_path or not self.tts:
             logger.info(f"Loading model: {full_model_path}")
-            self.tts = TTS(model_name=full_model_path).to(self.device)
+            self.tts = _get_tts_cls()(model_name=full_model_path).to(self.device)
+            self._tts_device = self.device
             self.selected_model = full_model_path
-        if self.device == "cuda":
+        if self.device == "cuda" and self._tts_device != "cuda":
             self.tts.to("cuda")
+            self._tts_device = "cuda"
         return self.tts
 
     def available_languages(self):
@@ -1,23 +1,23 @@
 import json
 import os
 import random
+import types
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 import gradio as gr
 import requests
 
 from handlers.args import ArgHandler
 from handlers.config import model_path
-from modules.yue.inference.infer import generate_music
-from modules.yue.inference.xcodec_mini_infer.utils.utils import seed_everything
 import logging
 
 logger = logging.getLogger(__name__)
 SEND_TO_PROCESS_BUTTON: gr.Button = None
 OUTPUT_MIX: gr.Audio = None
-arg_handler = ArgHandler()
+arg_handler = ArgHandler.get_instance()
 # Language mapping for selecting the correct Stage 1 model
-STAGE1_MODELS = {
+STAGE1_MODELS = types.MappingProxyType({
     "English": {
         "cot": "m-a-p/YuE-s1-7B-anneal-en-cot",
         "icl": "m-a-p/YuE-s1-7B-anneal-en-icl"
@@ -30,10 +30,28 @@ STAGE1_MODELS = {
         "cot": "m-a-p/YuE-s1-7B-anneal-jp-kr-cot",
         "icl": "m-a-p/YuE-s1-7B-anneal-jp-kr-icl"
     }
-}
+})
 
 base_model_url = "https://github.com/d8ahazard/AudioLab/releases/download/1.0.0/YuE_models.zip"
 
+_DESCRIPTIONS = types.MappingProxyType({
+    "model_language": "Select the language of the model to use for generation.",
+    "use_audio_prompt": "Check this box if you want to use an audio reference for generation.",
+    "genre_txt": "Enter genre tags to guide the music generation. Use spaces to separate multiple tags.",
+    "lyrics_txt": "Enter structured lyrics with [verse], [chorus], [bridge] labels. Separate lines with newlines.",
+    "audio_prompt_path": "Upload an audio file to use as a reference for generation.",
+    "prompt_start_time": "Specify the start time in seconds for the audio prompt.",
+    "prompt_end_time": "Specify the end time in seconds for the audio prompt.",
+    "max_new_tokens": "Set the maximum number of tokens to generate.",
+    "run_n_segments": "Specify how many segments to run during generation.",
+    "stage2_batch_size": "Set the batch size for Stage 2 of generation.",
+    "keep_intermediate": "Check this box to keep intermediate files generated during processing.",
+    "disable_offload_model": "Check this box to disable model offloading and run everything on CPU.",
+    "cuda_idx": "Specify the CUDA index to use for GPU processing.",
+    "rescale": "Check this box to rescale the output audio files.",
+    "seed": "Use -1 for random, or specify a seed for reproducibility."
+})
+
 
 def fetch_and_extxract_models():
     model_dir = os.path.join(model_path, "YuE")
@@ -41,14 +59,59 @@ def fetch_and_extxract_models():
         os.makedirs(model_dir, exist_ok=True)
     files_to_check = ["hf_1_325000", "ckpt_00360000.pth", "config.yaml", "config_decoder.yaml", "decoder_131000.pth",
                       "decoder_151000.pth", "tokenizer.model"]
-    if not all([os.path.exists(os.path.join(model_dir, f)) for f in files_to_check]):
+    if any(not os.path.exists(os.path.join(model_dir, f)) for f in files_to_check):
         model_dl = os.path.join(model_dir, "YuE_models.zip")
         if os.path.exists(model_dl):
             os.remove(model_dl)
-        with open(model_dl, "wb") as f:
-            f.write(requests.get(base_model_url).content)
-        with zipfile.ZipFile(os.path.join(model_dir, "YuE_models.zip"), 'r') as zip_ref:
-            zip_ref.extractall(model_dir)
+        written = 0
+        with requests.get(base_model_url, stream=True, timeout=60) as r:
+            r.raise_for_status()
+            expected_size = int(r.headers.get("Content-Length", 0))
+            with open(model_dl, "wb") as f:
+                for chunk in r.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+                    written += len(chunk)
+        # A short read leaves a zip without its central directory; member CRCs are checked on extraction
+        if expected_size and written != expected_size:
+            os.remove(model_dl)
+            raise RuntimeError(f"YuE model download is incomplete ({written} of {expected_size} bytes)")
+
+        root = os.path.realpath(model_dir)
+
+        def _is_safe(member):
+            # Member names are used for makedirs below, so refuse anything that resolves outside model_dir
+            target = os.path.realpath(os.path.join(model_dir, member.filename))
+            try:
+                return os.path.commonpath([root, target]) == root
+            except ValueError:
+                return False
+
+        def _is_extracted(member):
+            target = os.path.join(model_dir, member.filename)
+            if member.is_dir():
+                return os.path.isdir(target)
+            # A file cut short by an interrupted extraction exists but is smaller than the archived member
+            return os.path.isfile(target) and os.path.getsize(target) == member.file_size
+
+        with zipfile.ZipFile(model_dl, 'r') as zip_ref:
+            members = zip_ref.infolist()
+        for member in members:
+            if not _is_safe(member):
+                raise RuntimeError(f"YuE model archive contains an unsafe path: {member.filename}")
+        # Skip anything a previous, partial install already extracted in full
+        pending = [m for m in members if not _is_extracted(m)]
+        # Create the directory tree up front so the workers don't race on makedirs
+        for member in pending:
+            target = os.path.join(model_dir, member.filename)
+            os.makedirs(target if member.is_dir() else os.path.dirname(target), exist_ok=True)
+
+        def _extract(member):
+            # ZipFile handles aren't thread-safe, so each worker opens its own
+            with zipfile.ZipFile(model_dl, 'r') as zf:
+                zf.extract(member, model_dir)
+
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            list(executor.map(_extract, [m for m in pending if not m.is_dir()]))
         # Delete the zip file
         os.remove(model_dl)
 
@@ -195,6 +258,9 @@ def render(arg_handler: ArgHandler):
                         keep_intermediate, disable_offload_model, cuda_idx, rescale, seed,
                         progress=gr.Progress()
                 ):
+                    # Deferred so the YuE stack is only loaded when music is actually generated
+                    from modules.yue.inference.infer import generate_music
+                    from modules.yue.inference.xcodec_mini_infer.utils.utils import seed_everything
                     try:
                         # Calculate total steps: model setup + stage1 segments + stage2 processing + final processing
                         total_steps = 3 + run_n_segments + 2 + 2
@@ -314,6 +380,8 @@ def listen():
 def send_to_process(output_mix, process_inputs):
     if not output_mix or not os.path.exists(output_mix):
         return gr.update()
+    if not process_inputs:
+        process_inputs = []
     if output_mix in process_inputs:
         return gr.update()
     process_inputs.append(output_mix)
@@ -321,22 +389,4 @@ def send_to_process(output_mix, process_inputs):
 
 
 def register_descriptions(arg_handler: ArgHandler):
-    descriptions = {
-        "model_language": "Select the language of the model to use for generation.",
-        "use_audio_prompt": "Check this box if you want to use an audio reference for generation.",
-        "genre_txt": "Enter genre tags to guide the music generation. Use spaces to separate multiple tags.",
-        "lyrics_txt": "Enter structured lyrics with [verse], [chorus], [bridge] labels. Separate lines with newlines.",
-        "audio_prompt_path": "Upload an audio file to use as a reference for generation.",
-        "prompt_start_time": "Specify the start time in seconds for the audio prompt.",
-        "prompt_end_time": "Specify the end time in seconds for the audio prompt.",
-        "max_new_tokens": "Set the maximum number of tokens to generate.",
-        "run_n_segments": "Specify how many segments to run during generation.",
-        "stage2_batch_size": "Set the batch size for Stage 2 of generation.",
-        "keep_intermediate": "Check this box to keep intermediate files generated during processing.",
-        "disable_offload_model": "Check this box to disable model offloading and run everything on CPU.",
-        "cuda_idx": "Specify the CUDA index to use for GPU processing.",
-        "rescale": "Check this box to rescale the output audio files.",
-        "seed": "Use -1 for random, or specify a seed for reproducibility."
-    }
-    for elem_id, description in descriptions.items():
-        arg_handler.register_description("yue", elem_id, description)
+    arg_handler.register_descriptions_bulk("yue", _DESCRIPTIONS)
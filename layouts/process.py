@@ -161,7 +161,7 @@ def enforce_defaults(processors: List[str]):
 
 def process(processors: List[str], inputs: List[str], progress=gr.Progress()) -> List[str]:
     start_time = datetime.now()
-    settings = ArgHandler().get_args()
+    settings = ArgHandler.get_instance().get_args()
 
     progress(0, f"Processing with {len(processors)} processors...")
     outputs = []
@@ -1,5 +1,6 @@
 import json
 import logging
+import multiprocessing
 import os
 import pathlib
 import shutil
@@ -220,9 +221,19 @@ def extract_f0_feature(num_processors, extract_method, use_pitch_guidance, exp_d
             if gpus_rmvpe != "-":
                 gpus_rmvpe = gpus_rmvpe.split("-")
                 leng = len(gpus_rmvpe)
-                ps = []
-                for idx, n_g in enumerate(gpus_rmvpe):
-                    extract_f0_features_rmvpe(leng, idx, n_g, exp_dir, config.is_half)
+                if leng == 1:
+                    extract_f0_features_rmvpe(leng, 0, gpus_rmvpe[0], exp_dir, config.is_half)
+                else:
+                    # One worker per GPU, each addressing its own card; spawn because CUDA can't be reused in a forked child
+                    ctx = multiprocessing.get_context("spawn")
+                    ps = []
+                    for idx, n_g in enumerate(gpus_rmvpe):
+                        p = ctx.Process(target=extract_f0_features_rmvpe,
+                                        args=(leng, idx, n_g, exp_dir, config.is_half))
+                        ps.append(p)
+                        p.start()
+                    for p in ps:
+                        p.join()
             else:
                 extract_f0_features_rmvpe_dml(exp_dir)
     extract_feature_print(config.device, exp_dir, project_version, config.is_half)
@@ -5,7 +5,7 @@ import gradio as gr
 from handlers.args import ArgHandler
 from handlers.tts import TTSHandler
 
-arg_handler = ArgHandler()
+arg_handler = ArgHandler.get_instance()
 SEND_TO_PROCESS_BUTTON: gr.Button = None
 OUTPUT_AUDIO: gr.Audio = None
 
@@ -10,7 +10,7 @@ from handlers.config import output_path, model_path, app_path
 from modules.zonos.conditioning import supported_language_codes
 
 logger = logging.getLogger(__name__)
-arg_handler = ArgHandler()
+arg_handler = ArgHandler.get_instance()
 SEND_TO_PROCESS_BUTTON: gr.Button = None
 OUTPUT_AUDIO: gr.Audio = None
 zonos_model = None
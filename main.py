@@ -75,7 +75,7 @@ if __name__ == '__main__':
         uvicorn.run(app, host=server_name, port=server_port)
     else:
         # Set up the UI
-        arg_handler = ArgHandler()
+        arg_handler = ArgHandler.get_instance()
         process_register_descriptions(arg_handler)
         music_register_descriptions(arg_handler)
         tts_register_descriptions(arg_handler)
@@ -23,6 +23,7 @@ class FeatureInput(object):
         self.f0_min = 50.0
         self.f0_mel_min = 1127 * np.log(1 + self.f0_min / 700)
         self.f0_mel_max = 1127 * np.log(1 + self.f0_max / 700)
+        self.f0_mel_scale = (self.f0_bin - 2) / (self.f0_mel_max - self.f0_mel_min)
 
     def compute_f0(self, audio_path, f0_method):
         audio, _ = load_audio(audio_path, self.fs)
@@ -79,13 +80,12 @@ class FeatureInput(object):
         return f0
 
     def coarse_f0(self, f0):
+        # Unvoiced frames (f0 == 0) land below 1 after scaling, so one clip replaces the masked writes
         f0_mel = 1127 * np.log(1 + f0 / 700)
-        f0_mel[f0_mel > 0] = (f0_mel[f0_mel > 0] - self.f0_mel_min) * (
-            self.f0_bin - 2
-        ) / (self.f0_mel_max - self.f0_mel_min) + 1
-
-        f0_mel[f0_mel <= 1] = 1
-        f0_mel[f0_mel > self.f0_bin - 1] = self.f0_bin - 1
+        f0_mel -= self.f0_mel_min
+        f0_mel *= self.f0_mel_scale
+        f0_mel += 1
+        np.clip(f0_mel, 1, self.f0_bin - 1, out=f0_mel)
         f0_coarse = np.rint(f0_mel).astype(int)
         assert f0_coarse.max() <= 255 and f0_coarse.min() >= 1, (
             f0_coarse.max(),
@@ -1,6 +1,8 @@
 import logging
 import os
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -12,18 +14,21 @@ is_half = False
 
 
 class FeatureInput(object):
-    def __init__(self, samplerate=16000, hop_size=160):
+    def __init__(self, samplerate=16000, hop_size=160, device="cuda"):
         self.fs = samplerate
         self.hop = hop_size
+        self.device = device
 
         self.f0_bin = 256
         self.f0_max = 1100.0
         self.f0_min = 50.0
         self.f0_mel_min = 1127 * np.log(1 + self.f0_min / 700)
         self.f0_mel_max = 1127 * np.log(1 + self.f0_max / 700)
+        self.f0_mel_scale = (self.f0_bin - 2) / (self.f0_mel_max - self.f0_mel_min)
 
-    def compute_f0(self, path, f0_method):
-        x, _ = load_audio(path, self.fs)
+    def compute_f0(self, path, f0_method, x=None):
+        if x is None:
+            x, _ = load_audio(path, self.fs)
         # p_len = x.shape[0] // self.hop
         if f0_method == "rmvpe":
             if hasattr(self, "model_rmvpe") == False:
@@ -32,20 +37,18 @@ class FeatureInput(object):
                 print("Loading rmvpe model")
                 rmvpe_path = os.path.join(model_path, "rvc", "rmvpe.pt")
                 self.model_rmvpe = RMVPE(
-                    rmvpe_path, is_half=is_half, device="cuda"
+                    rmvpe_path, is_half=is_half, device=self.device
                 )
             f0 = self.model_rmvpe.infer_from_audio(x, thred=0.03)
         return f0
 
     def coarse_f0(self, f0):
+        # Unvoiced frames (f0 == 0) land below 1 after scaling, so one clip replaces the masked writes
         f0_mel = 1127 * np.log(1 + f0 / 700)
-        f0_mel[f0_mel > 0] = (f0_mel[f0_mel > 0] - self.f0_mel_min) * (
-                self.f0_bin - 2
-        ) / (self.f0_mel_max - self.f0_mel_min) + 1
-
-        # use 0 or 1
-        f0_mel[f0_mel <= 1] = 1
-        f0_mel[f0_mel > self.f0_bin - 1] = self.f0_bin - 1
+        f0_mel -= self.f0_mel_min
+        f0_mel *= self.f0_mel_scale
+        f0_mel += 1
+        np.clip(f0_mel, 1, self.f0_bin - 1, out=f0_mel)
         f0_coarse = np.rint(f0_mel).astype(int)
         assert f0_coarse.max() <= 255 and f0_coarse.min() >= 1, (
             f0_coarse.max(),
@@ -53,44 +56,59 @@ class FeatureInput(object):
         )
         return f0_coarse
 
-    def go(self, paths, f0_method):
+    def go(self, paths, f0_method, prefetch=4):
         if len(paths) == 0:
             print("no-f0-todo")
         else:
             print("todo-f0-%s" % len(paths))
             n = max(len(paths) // 5, 1)  # 每个进程最多打印5条
-            for idx, (inp_path, opt_path1, opt_path2) in enumerate(paths):
-                try:
-                    if idx % n == 0:
-                        print("f0ing,now-%s,all-%s,-%s" % (idx, len(paths), inp_path))
-                    if (
-                            os.path.exists(opt_path1 + ".npy") == True
-                            and os.path.exists(opt_path2 + ".npy") == True
-                    ):
-                        continue
-                    featur_pit = self.compute_f0(inp_path, f0_method)
-                    np.save(
-                        opt_path2,
-                        featur_pit,
-                        allow_pickle=False,
-                    )  # nsf
-                    coarse_pit = self.coarse_f0(featur_pit)
-                    np.save(
-                        opt_path1,
-                        coarse_pit,
-                        allow_pickle=False,
-                    )  # ori
-                except:
-                    print("f0fail-%s-%s-%s" % (idx, inp_path, traceback.format_exc()))
+            todo = iter([
+                (idx, inp_path, opt_path1, opt_path2)
+                for idx, (inp_path, opt_path1, opt_path2) in enumerate(paths)
+                if not (os.path.exists(opt_path1 + ".npy") and os.path.exists(opt_path2 + ".npy"))
+            ])
+            # Decode the next few files on worker threads while RMVPE runs on the current one
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                queue = deque()
+
+                def _enqueue():
+                    item = next(todo, None)
+                    if item is not None:
+                        queue.append((item, executor.submit(load_audio, item[1], self.fs)))
+
+                for _ in range(prefetch):
+                    _enqueue()
+                while queue:
+                    (idx, inp_path, opt_path1, opt_path2), future = queue.popleft()
+                    _enqueue()
+                    try:
+                        if idx % n == 0:
+                            print("f0ing,now-%s,all-%s,-%s" % (idx, len(paths), inp_path))
+                        x, _ = future.result()
+                        featur_pit = self.compute_f0(inp_path, f0_method, x=x)
+                        np.save(
+                            opt_path2,
+                            featur_pit,
+                            allow_pickle=False,
+                        )  # nsf
+                        coarse_pit = self.coarse_f0(featur_pit)
+                        np.save(
+                            opt_path1,
+                            coarse_pit,
+                            allow_pickle=False,
+                        )  # ori
+                    except:
+                        print("f0fail-%s-%s-%s" % (idx, inp_path, traceback.format_exc()))
 
 
 def extract_f0_features_rmvpe(n_part, i_part, i_gpu, exp_dir, is_half_infer, sample_rate=16000):
     global is_half
     is_half = is_half_infer
-    os.environ["CUDA_VISIBLE_DEVICES"] = str(i_gpu)
     with open(f"{exp_dir}/extract_f0_feature.log", "a+") as f:
         print("Starting RMVPE F0 feature extraction", f)
-        feature_input = FeatureInput(samplerate=sample_rate)
+        # CUDA is already initialised by the time this runs (in the app, or in a spawned child re-importing it),
+        # so CUDA_VISIBLE_DEVICES would be ignored; address the card directly instead
+        feature_input = FeatureInput(samplerate=sample_rate, device=f"cuda:{i_gpu}")
         paths = []
         inp_root = f"{exp_dir}/1_16k_wavs"
         opt_root1 = f"{exp_dir}/2a_f0"
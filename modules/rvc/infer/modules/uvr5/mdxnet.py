@@ -57,7 +57,7 @@ class ConvTDFNetTrim:
 
     def istft(self, x, freq_pad=None):
         freq_pad = (
-            self.freq_pad.repeat([x.shape[0], 1, 1, 1])
+            self.freq_pad.expand(x.shape[0], -1, -1, -1)
             if freq_pad is None
             else freq_pad
         )
@@ -70,7 +70,12 @@ class ConvTDFNetTrim:
         x = x.contiguous()
         x = torch.view_as_complex(x)
         x = torch.istft(
-            x, n_fft=self.n_fft, hop_length=self.hop, window=self.window, center=True
+            x,
+            n_fft=self.n_fft,
+            hop_length=self.hop,
+            window=self.window,
+            center=True,
+            length=self.chunk_size,
         )
         return x.reshape([-1, c, self.chunk_size])
 
@@ -128,7 +133,8 @@ class Predictor:
 
             start = skip - s_margin
 
-            segmented_mix[skip] = mix[:, start:end].copy()
+            # A view is enough: demix_base pads each segment into a new array anyway
+            segmented_mix[skip] = mix[:, start:end]
             if end == samples:
                 break
 
@@ -141,39 +147,48 @@ class Predictor:
         return sources
 
     def demix_base(self, mixes, margin_size):
-        chunked_sources = []
         progress_bar = tqdm(total=len(mixes))
         progress_bar.set_description("Processing")
+        # These only depend on the model, so work them out once rather than per segment
+        model = self.model_
+        trim = model.n_fft // 2
+        gen_size = model.chunk_size - 2 * trim
+        last_mix = next(reversed(mixes))
+        # Every segment keeps its samples minus the overlap margins, so the output can be sized up front
+        total = sum(
+            cmix.shape[1]
+            - (0 if key == 0 else margin_size)
+            - (0 if key == last_mix or margin_size == 0 else margin_size)
+            for key, cmix in mixes.items()
+        )
+        _sources = np.empty((1, 2, total), dtype=np.float32)
+        offset = 0
         for mix in mixes:
             cmix = mixes[mix]
-            sources = []
             n_sample = cmix.shape[1]
-            model = self.model_
-            trim = model.n_fft // 2
-            gen_size = model.chunk_size - 2 * trim
             pad = gen_size - n_sample % gen_size
             mix_p = np.concatenate(
                 (np.zeros((2, trim)), cmix, np.zeros((2, pad)), np.zeros((2, trim))), 1
             )
-            mix_waves = []
-            i = 0
-            while i < n_sample + pad:
-                waves = np.array(mix_p[:, i : i + model.chunk_size])
-                mix_waves.append(waves)
-                i += gen_size
-            mix_waves = torch.tensor(mix_waves, dtype=torch.float32).to(cpu)
+            # Gather every window of the segment into one batch so the session runs once per segment
+            offsets = range(0, n_sample + pad, gen_size)
+            mix_waves = np.empty((len(offsets), 2, model.chunk_size), dtype=np.float32)
+            for idx, i in enumerate(offsets):
+                mix_waves[idx] = mix_p[:, i : i + model.chunk_size]
+            mix_waves = torch.from_numpy(mix_waves)
             with torch.no_grad():
                 _ort = self.model
-                spek = model.stft(mix_waves)
+                # The STFT runs on the CPU, so hand ORT one contiguous view instead of a copy per run
+                spek = np.ascontiguousarray(model.stft(mix_waves).numpy())
                 if self.args.denoise:
-                    spec_pred = (
-                        -_ort.run(None, {"input": -spek.cpu().numpy()})[0] * 0.5
-                        + _ort.run(None, {"input": spek.cpu().numpy()})[0] * 0.5
-                    )
-                    tar_waves = model.istft(torch.tensor(spec_pred))
+                    # Run both polarities as one batch rather than two session calls
+                    n_waves = spek.shape[0]
+                    pred = _ort.run(None, {"input": np.concatenate((-spek, spek))})[0]
+                    spec_pred = -pred[:n_waves] * 0.5 + pred[n_waves:] * 0.5
+                    tar_waves = model.istft(torch.from_numpy(spec_pred))
                 else:
                     tar_waves = model.istft(
-                        torch.tensor(_ort.run(None, {"input": spek.cpu().numpy()})[0])
+                        torch.from_numpy(_ort.run(None, {"input": spek})[0])
                     )
                 tar_signal = (
                     tar_waves[:, :, trim:-trim]
@@ -183,15 +198,15 @@ class Predictor:
                 )
 
                 start = 0 if mix == 0 else margin_size
-                end = None if mix == list(mixes.keys())[::-1][0] else -margin_size
+                end = None if mix == last_mix else -margin_size
                 if margin_size == 0:
                     end = None
-                sources.append(tar_signal[:, start:end])
+                kept = tar_signal[:, start:end]
+                _sources[0, :, offset : offset + kept.shape[1]] = kept
+                offset += kept.shape[1]
 
                 progress_bar.update(1)
 
-            chunked_sources.append(sources)
-        _sources = np.concatenate(chunked_sources, axis=-1)
         # del self.model
         progress_bar.close()
         return _sources
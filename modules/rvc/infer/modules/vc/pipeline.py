@@ -17,6 +17,8 @@ if os.path.basename(sys.argv[0]) == "pipeline.py":
 import traceback
 from time import time as ttime
 import argparse
+from functools import lru_cache
+from math import gcd
 from typing import Dict, List, Optional, Any
 
 import librosa
@@ -103,6 +105,13 @@ def debug_clone_audio(audio_data, sr, step_name):
     DEBUG_STEP_NO += 1
 
 
+@lru_cache(maxsize=8)
+def _resample_filter(up, down):
+    # Same anti-aliasing FIR resample_poly designs by default, kept across calls for a given ratio
+    max_rate = max(up, down)
+    return signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+
+
 class Pipeline(object):
     def __init__(self, tgt_sr, config, downsample_pipeline, processing_sr=None):
         """
@@ -136,16 +145,48 @@ class Pipeline(object):
         self.t_max = int(self.sr * self.x_max)
         self.device = config.device
         # High-pass filter (5th order Butterworth at ~48 Hz) for input audio
-        self.bh, self.ah = signal.butter(N=5, Wn=48, btype="high", fs=self.sr)
+        self.hp_sos = signal.butter(N=5, Wn=48, btype="high", fs=self.sr, output="sos")
         self.tgt_sr = tgt_sr
         self.is_half = config.is_half
+        # (path, mtime, index, big_npy) of the last FAISS index read, shared by the channels of a stereo clone
+        self._index_cache = None
+        # F0 extractor (and the RMVPE model it lazily loads), kept for the life of the pipeline
+        self._feature_extractor = None
+        # GPU resources backing the cached FAISS index, when it was moved to the GPU
+        self._faiss_res = None
+
+    def close(self):
+        """Release the cached F0 extractor, FAISS index and its GPU resources."""
+        self._feature_extractor = None
+        self._index_cache = None
+        self._faiss_res = None
+
+    def load_index(self, file_index):
+        """Read a FAISS index and its vectors, reusing the previous read for the same unchanged file."""
+        mtime = os.path.getmtime(file_index)
+        if self._index_cache is not None and self._index_cache[:2] == (file_index, mtime):
+            return self._index_cache[2], self._index_cache[3]
+        import faiss
+        index = faiss.read_index(file_index)
+        big_npy = index.reconstruct_n(0, index.ntotal)
+        # setup scripts install faiss-cpu; only a faiss-gpu build exposes StandardGpuResources
+        if "cuda" in str(self.device) and hasattr(faiss, "StandardGpuResources"):
+            try:
+                self._faiss_res = faiss.StandardGpuResources()
+                index = faiss.index_cpu_to_gpu(self._faiss_res, torch.device(self.device).index or 0, index)
+            except Exception as e:
+                logger.warning(f"Could not move FAISS index to GPU, searching on CPU: {e}")
+        self._index_cache = (file_index, mtime, index, big_npy)
+        return index, big_npy
 
     def get_f0(self, audio, p_len, f0_up_key, f0_method, filter_radius, inp_f0=None,
                merge_type="median", crepe_hop_length=160, f0_autotune=False,
                rmvpe_onnx=False, f0_min=50, f0_max=1100):
         """Extract F0 using specified method, with optional smoothing."""
-        from modules.rvc.pitch_extraction import FeatureExtractor
-        fe = FeatureExtractor(self.tgt_sr, self.config, onnx=rmvpe_onnx)
+        fe = self._feature_extractor
+        if fe is None or fe.onnx != rmvpe_onnx:
+            from modules.rvc.pitch_extraction import FeatureExtractor
+            fe = self._feature_extractor = FeatureExtractor(self.tgt_sr, self.config, onnx=rmvpe_onnx)
         pitch, pitchf = fe.get_f0(
             audio, f0_up_key, f0_method,
             merge_type=merge_type,
@@ -156,7 +197,6 @@ class Pipeline(object):
             inp_f0=inp_f0,
             f0_min=f0_min, f0_max=f0_max
         )
-        del fe
         # Ensure length consistency
         pitch = pitch[:p_len]
         pitchf = pitchf[:p_len]
@@ -190,16 +230,15 @@ class Pipeline(object):
         if protect < 0.5 and pitch is not None and pitchf is not None:
             feats0 = feats.clone()
         if index is not None and big_npy is not None and index_rate != 0:
-            npy = feats[0].cpu().numpy()
-            if self.is_half:
-                npy = npy.astype("float32")
+            # FAISS works in float32; cast once on the device and let torch cast back on upload
+            npy = feats[0].float().cpu().numpy()
             score, ix = index.search(npy, k=8)
             weight = np.square(1 / score)
             weight /= weight.sum(axis=1, keepdims=True)
-            npy = np.sum(big_npy[ix] * np.expand_dims(weight, axis=2), axis=1)
-            if self.is_half:
-                npy = npy.astype("float16")
-            feats = torch.from_numpy(npy).unsqueeze(0).to(self.device) * index_rate + (1 - index_rate) * feats
+            # Weighted sum of the 8 neighbours without materialising the (T, 8, D) product
+            npy = np.einsum("tkd,tk->td", big_npy[ix], weight)
+            feats = (torch.from_numpy(npy).unsqueeze(0).to(self.device, dtype=feats.dtype) * index_rate
+                     + (1 - index_rate) * feats)
 
         feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(0, 2, 1)
         if protect < 0.5 and pitch is not None and pitchf is not None:
@@ -212,20 +251,16 @@ class Pipeline(object):
                 pitch = pitch[:, :seg_frames]
                 pitchf = pitchf[:, :seg_frames]
         if protect < 0.5 and pitch is not None and pitchf is not None:
-            mask = pitchf.clone()
-            mask[pitchf > 0] = 1.0
-            mask[pitchf < 1] = protect
-            mask = mask.unsqueeze(-1)
-            feats = feats * mask + feats0 * (1 - mask)
-            feats = feats.to(feats0.dtype)
+            # Voiced frames keep the converted features, the rest lean towards the original by `protect`
+            mask = torch.where(pitchf < 1, torch.full_like(pitchf, protect), torch.ones_like(pitchf))
+            mask = mask.unsqueeze(-1).to(feats0.dtype)
+            feats = torch.lerp(feats0, feats.to(feats0.dtype), mask)
         seg_len_tensor = torch.tensor([seg_frames], device=self.device).long()
         with torch.no_grad():
             if pitch is not None and pitchf is not None:
                 audio_out = net_g.infer(feats, seg_len_tensor, pitch, pitchf, sid)[0][0,0].data.cpu().float().numpy()
             else:
                 audio_out = net_g.infer(feats, seg_len_tensor, sid)[0][0,0].data.cpu().float().numpy()
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
         t2 = ttime()
         times[0] += t1 - t0
         times[2] += t2 - t1
@@ -240,22 +275,21 @@ class Pipeline(object):
         index = big_npy = None
         if file_index is not None and file_index != "" and index_rate != 0 and os.path.exists(file_index):
             try:
-                import faiss
-                index = faiss.read_index(file_index)
-                big_npy = index.reconstruct_n(0, index.ntotal)
+                index, big_npy = self.load_index(file_index)
             except Exception as e:
                 traceback.print_exc()
                 index = big_npy = None
         try:
-            audio = signal.filtfilt(self.bh, self.ah, audio)
+            audio = signal.sosfiltfilt(self.hp_sos, np.ascontiguousarray(audio, dtype=np.float64))
         except Exception as e:
             pass
         audio_pad = np.pad(audio, (self.window//2, self.window//2), mode="reflect")
         opt_ts = []
         if audio_pad.shape[0] > self.t_max:
-            audio_sum = np.zeros_like(audio)
-            for i in range(self.window):
-                audio_sum += np.abs(audio_pad[i: i - self.window])
+            # Moving sum of |audio| over one window, taken as a difference of cumulative sums
+            csum = np.zeros(audio_pad.shape[0] + 1, dtype=np.float64)
+            np.cumsum(np.abs(audio_pad), dtype=np.float64, out=csum[1:])
+            audio_sum = csum[self.window: self.window + audio.shape[0]] - csum[:audio.shape[0]]
             for t in range(self.t_center, audio.shape[0], self.t_center):
                 opt_ts.append(
                     t
@@ -272,9 +306,7 @@ class Pipeline(object):
         inp_f0 = None
         if f0_file is not None and hasattr(f0_file, "name"):
             try:
-                with open(f0_file.name, "r") as f:
-                    lines = [line.strip() for line in f]
-                inp_f0 = np.array([[float(x) for x in line.split(",")] for line in lines], dtype="float32")
+                inp_f0 = np.loadtxt(f0_file.name, delimiter=",", dtype="float32", ndmin=2)
             except Exception as e:
                 traceback.print_exc()
                 inp_f0 = None
@@ -317,6 +349,9 @@ class Pipeline(object):
                                        version, protect)
         final_audio = final_audio[self.t_pad_tgt : -self.t_pad_tgt]
         audio_opt_segments.append(final_audio)
+        # Hand cached blocks back once per track rather than syncing the device after every segment
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
         audio_opt = np.concatenate(audio_opt_segments)
         debug_clone_audio(audio_opt, tgt_sr, f"vc_single_final_audio")
         if pitch_correction:
@@ -326,14 +361,17 @@ class Pipeline(object):
             )
             debug_clone_audio(audio_opt, tgt_sr, f"vc_single_final_audio_after_pitch_correction")
         if tgt_sr != og_sr and og_sr is not None:
-            audio_opt = librosa.resample(audio_opt, orig_sr=tgt_sr, target_sr=og_sr)
+            g = gcd(tgt_sr, og_sr)
+            up, down = og_sr // g, tgt_sr // g
+            audio_opt = signal.resample_poly(audio_opt, up, down, window=_resample_filter(up, down)).astype(np.float32)
             final_sr = og_sr
             debug_clone_audio(audio_opt, final_sr, f"vc_single_final_audio_after_resampling")
         else:
             final_sr = tgt_sr
-        peak = np.max(np.abs(audio_opt))
+        # Peak from the two extremes avoids an |x| temporary; the output buffer is ours, so scale in place
+        peak = max(audio_opt.max(), -audio_opt.min()) if audio_opt.size else 0.0
         if peak > 0.99:
-            audio_opt = audio_opt * (0.99 / peak)
+            audio_opt *= 0.99 / peak
             debug_clone_audio(audio_opt, final_sr, f"vc_single_final_audio_after_peak_clipping")
         return audio_opt, final_sr
 
@@ -364,6 +402,8 @@ class VC:
         if sid == "" or sid == []:
             if self.hubert_model is not None:
                 logger.info("Cleaning model cache")
+                if self.pipeline is not None:
+                    self.pipeline.close()
                 del (self.net_g, self.n_spk, self.hubert_model, self.tgt_sr)
                 self.hubert_model = self.net_g = self.n_spk = self.tgt_sr = None
                 if torch.cuda.is_available():
@@ -451,10 +491,12 @@ class VC:
                 )
         try:
             sr_rvc = 16000  # Always process at 16kHz for Hubert
-            if not self.downsample_pipeline:
-                self.pipeline = Pipeline(self.tgt_sr, self.config, self.downsample_pipeline, processing_sr=og_sr)
             if self.pipeline is None:
                 self.get_vc(model)
+            # Keep the pipeline (and its cached F0 extractor / FAISS index) while tgt_sr and processing_sr are unchanged
+            if not self.downsample_pipeline and (self.pipeline.tgt_sr, self.pipeline.sr) != (self.tgt_sr, og_sr):
+                self.pipeline.close()
+                self.pipeline = Pipeline(self.tgt_sr, self.config, self.downsample_pipeline, processing_sr=og_sr)
             if self.hubert_model is None:
                 self.hubert_model = load_hubert(self.config)
             def process_track(wav, label):
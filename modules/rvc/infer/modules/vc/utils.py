@@ -1,14 +1,10 @@
 import os
 from functools import lru_cache
 
-import os
-from functools import lru_cache
-
 import librosa
+import numpy as np
 import pyworld
-import torch
 from fairseq import checkpoint_utils
-from torch.nn import functional as F
 
 from handlers.config import model_path
 
@@ -101,7 +97,7 @@ def extract_index_from_zip(zip_path, extract_to):
     return extracted_file_path
 
 
-@lru_cache
+@lru_cache(maxsize=32)
 def cache_harvest_f0(input_audio_path, fs, f0max, f0min, frame_period):
     from modules.rvc.infer.modules.vc.pipeline import input_audio_path2wav
 
@@ -117,20 +113,18 @@ def cache_harvest_f0(input_audio_path, fs, f0max, f0min, frame_period):
     return f0
 
 
+def _interp_linear(values, size):
+    # Same sample positions as F.interpolate(mode="linear", align_corners=False), edges clamped
+    x = (np.arange(size) + 0.5) * (values.shape[0] / size) - 0.5
+    return np.interp(x, np.arange(values.shape[0]), values)
+
+
 def change_rms(data1, sr1, data2, sr2, rate):
     rms1 = librosa.feature.rms(
         y=data1, frame_length=sr1 // 2 * 2, hop_length=sr1 // 2
-    )  # 每半秒一个点
-    rms2 = librosa.feature.rms(y=data2, frame_length=sr2 // 2 * 2, hop_length=sr2 // 2)
-    rms1 = torch.from_numpy(rms1)
-    rms1 = F.interpolate(rms1.unsqueeze(0), size=data2.shape[0], mode="linear").squeeze()
-    rms2 = torch.from_numpy(rms2)
-    rms2 = F.interpolate(rms2.unsqueeze(0), size=data2.shape[0], mode="linear").squeeze()
-    rms2 = torch.max(rms2, torch.zeros_like(rms2) + 1e-6)
-    data2 *= (
-            torch.pow(rms1, torch.tensor(1 - rate))
-            * torch.pow(rms2, torch.tensor(rate - 1))
-    ).numpy()
+    )[0]  # 每半秒一个点
+    rms2 = librosa.feature.rms(y=data2, frame_length=sr2 // 2 * 2, hop_length=sr2 // 2)[0]
+    rms1 = _interp_linear(rms1, data2.shape[0])
+    rms2 = np.maximum(_interp_linear(rms2, data2.shape[0]), 1e-6)
+    data2 *= (np.power(rms1, 1 - rate) * np.power(rms2, rate - 1)).astype(data2.dtype)
     return data2
-
-
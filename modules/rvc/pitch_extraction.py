@@ -170,24 +170,28 @@ class FeatureExtractor:
         return f0
 
     def get_harvest(self, x, *args, **kwargs):
+        # One float64 buffer for both calls; no copy at all when x already is one
+        x = np.ascontiguousarray(x, dtype=np.double)
         f0_spectral = pyworld.harvest(
-            x.astype(np.double),
+            x,
             fs=self.sr,
             f0_ceil=kwargs.get('f0_max'),
             f0_floor=kwargs.get('f0_min'),
             frame_period=1000 * kwargs.get('hop_length', 160) / self.sr,
         )
-        return pyworld.stonemask(x.astype(np.double), *f0_spectral, self.sr)
+        return pyworld.stonemask(x, *f0_spectral, self.sr)
 
     def get_dio(self, x, *args, **kwargs):
+        # One float64 buffer for both calls; no copy at all when x already is one
+        x = np.ascontiguousarray(x, dtype=np.double)
         f0_spectral = pyworld.dio(
-            x.astype(np.double),
+            x,
             fs=self.sr,
             f0_ceil=kwargs.get('f0_max'),
             f0_floor=kwargs.get('f0_min'),
             frame_period=1000 * kwargs.get('hop_length', 160) / self.sr,
         )
-        return pyworld.stonemask(x.astype(np.double), *f0_spectral, self.sr)
+        return pyworld.stonemask(x, *f0_spectral, self.sr)
 
     def get_rmvpe(self, x, *args, **kwargs):
         if not hasattr(self, "model_rmvpe") or self.model_rmvpe is None:
@@ -342,10 +346,12 @@ class FeatureExtractor:
             shape = f0[self.x_pad * tf0: self.x_pad * tf0 + len(replace_f0)].shape[0]
             f0[self.x_pad * tf0: self.x_pad * tf0 + len(replace_f0)] = replace_f0[:shape]
 
+        # Unvoiced frames (f0 == 0) land below 1 after scaling, so one clip replaces the masked writes
         f0_mel = 1127 * np.log(1 + f0 / 700)
-        f0_mel[f0_mel > 0] = (f0_mel[f0_mel > 0] - f0_mel_min) * 254 / (f0_mel_max - f0_mel_min) + 1
-        f0_mel[f0_mel <= 1] = 1
-        f0_mel[f0_mel > 255] = 255
+        f0_mel -= f0_mel_min
+        f0_mel *= 254 / (f0_mel_max - f0_mel_min)
+        f0_mel += 1
+        np.clip(f0_mel, 1, 255, out=f0_mel)
         f0_coarse = np.rint(f0_mel).astype(int)
         gc_collect()
 
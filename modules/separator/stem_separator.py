@@ -2,8 +2,10 @@
 import logging
 import os
 import subprocess
+import threading
 import uuid
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Callable
 
 import librosa
@@ -99,12 +101,13 @@ class EnsembleDemucsMDXMusicSeparationModel:
         self.device = torch.device("cuda:0") if torch.cuda.is_available() and not options.get("cpu", False) \
             else torch.device("cpu")
         patch_separator()
-        self.separator = Separator(
+        separator_kwargs = dict(
             log_level=logging.ERROR,
             model_file_dir=os.path.join(app_path, "models", "audio_separator"),
             invert_using_spec=True,
             use_autocast=True
         )
+        self.separator = Separator(**separator_kwargs)
         # Download all required models
         self.model_list = [
             "htdemucs_ft.yaml", "htdemucs.yaml", "hdemucs_mmi.yaml", "htdemucs_6s.yaml",
@@ -114,8 +117,19 @@ class EnsembleDemucsMDXMusicSeparationModel:
             "17_HP-Wind_Inst-UVR.pth",
             "kuielab_a_bass.onnx"
         ]
-        for model in self.model_list:
-            self.separator.download_model_files(model)
+        # The first call also fetches the shared model index, so let it finish before fanning out
+        self.separator.download_model_files(self.model_list[0])
+        # download_model_files keeps the current model's details on the Separator and reads them back to pick
+        # the download repo, so concurrent downloads each need a Separator of their own
+        worker_state = threading.local()
+
+        def _download(model_file):
+            if not hasattr(worker_state, "separator"):
+                worker_state.separator = Separator(**separator_kwargs)
+            worker_state.separator.download_model_files(model_file)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_download, self.model_list[1:]))
 
         # Flags and options
         self.vocals_only = bool(options.get("vocals_only", False))
@@ -150,6 +164,21 @@ class EnsembleDemucsMDXMusicSeparationModel:
         self.total_steps = 0
         self.callback = options.get("callback", None)
 
+        # Name of the model currently held by the separator, so repeated loads can be skipped
+        self._loaded_model = None
+
+    def _load_model(self, model_file: str) -> None:
+        """
+        Loads a model into the separator unless it is already the active one.
+
+        Parameters:
+            model_file (str): Model filename understood by audio_separator.
+        """
+        if self._loaded_model == model_file:
+            return
+        self.separator.load_model(model_file)
+        self._loaded_model = model_file
+
     def _advance_progress(self, desc: str, weight: int = 1) -> None:
         """
         Increments progress by a given weight and calls the callback with the current progress.
@@ -251,7 +280,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
         models_with_weights = models_with_weights[:self.ensemble_strength]
 
         for model_name, v_wt, i_wt in models_with_weights:
-            self.separator.load_model(model_name)
+            self._load_model(model_name)
             for file in files_data:
                 base_name = file["base_name"]
                 mix_np = file["mix_np"]
@@ -279,7 +308,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
         Parameters:
             results (Dict[str, Dict]): Separation results.
         """
-        self.separator.load_model("htdemucs_6s.yaml")
+        self._load_model("htdemucs_6s.yaml")
         for base_name, res in results.items():
             sr = res["sr"]
             inst = res["instrumental"]
@@ -320,7 +349,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
         Parameters:
             results (Dict[str, Dict]): Separation results.
         """
-        self.separator.load_model("kuielab_a_bass.onnx")
+        self._load_model("kuielab_a_bass.onnx")
         for base_name, res in results.items():
             sr = res["sr"]
             inst = res["instrumental"]
@@ -349,7 +378,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
         Parameters:
             results (Dict[str, Dict]): Separation results.
         """
-        self.separator.load_model("MDX23C-DrumSep-aufr33-jarredou.ckpt")
+        self._load_model("MDX23C-DrumSep-aufr33-jarredou.ckpt")
         for base_name, res in results.items():
             sr = res["sr"]
             drums = res.get("drums", np.zeros_like(res["instrumental"]))
@@ -392,7 +421,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
         Parameters:
             results (Dict[str, Dict]): Separation results.
         """
-        self.separator.load_model("17_HP-Wind_Inst-UVR.pth")
+        self._load_model("17_HP-Wind_Inst-UVR.pth")
         for base_name, res in results.items():
             sr = res["sr"]
             other = res.get("other", np.zeros_like(res["instrumental"]))
@@ -450,19 +479,26 @@ class EnsembleDemucsMDXMusicSeparationModel:
             "drums_crash": "(Drums_Crash)",
             "drums_other": "(Drums_Other)"
         }
-        for base_name, res in results.items():
-            sr = res["sr"]
-            output_folder = res["output_folder"]
-            for stem_key, label in stem_names.items():
-                if stem_key in res and res[stem_key] is not None:
-                    if stem_key == "bg_vocals" and "bg_vocals_" in base_name:
-                        bg_int = int(base_name.split("bg_vocals_")[-1])
-                        label = f"(BG_Vocals_{bg_int})"
-                    output_name = f"{base_name}__{label}.wav"
-                    output_path_file = os.path.join(output_folder, output_name)
-                    sf.write(output_path_file, res[stem_key].T, sr, subtype="FLOAT")
-                    output_files.append(output_path_file)
-            self._advance_progress(f"Stems saved for {base_name}.")
+        # libsndfile releases the GIL while encoding, so the stems of a file are written side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(stem_names))) as executor:
+            for base_name, res in results.items():
+                sr = res["sr"]
+                output_folder = res["output_folder"]
+                futures = []
+                for stem_key, label in stem_names.items():
+                    if stem_key in res and res[stem_key] is not None:
+                        if stem_key == "bg_vocals" and "bg_vocals_" in base_name:
+                            bg_int = int(base_name.split("bg_vocals_")[-1])
+                            label = f"(BG_Vocals_{bg_int})"
+                        output_name = f"{base_name}__{label}.wav"
+                        output_path_file = os.path.join(output_folder, output_name)
+                        # Pass the transposed view; soundfile makes it contiguous inside the worker
+                        futures.append(executor.submit(sf.write, output_path_file, res[stem_key].T, sr,
+                                                       subtype="FLOAT"))
+                        output_files.append(output_path_file)
+                for future in futures:
+                    future.result()
+                self._advance_progress(f"Stems saved for {base_name}.")
         for base_name, res in results.items():
             output_folder = res["output_folder"]
             for temp_file in os.listdir(output_folder):
@@ -544,7 +580,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
                                            otherwise, returns (original vocals_array, None).
         """
         tmp_file = write_temp_wav(vocals_array, sr, output_folder)
-        self.separator.load_model("UVR-BVE-4B_SN-44100-1.pth")
+        self._load_model("UVR-BVE-4B_SN-44100-1.pth")
         self.separator.output_dir = output_folder
         self.separator.model_instance.output_dir = output_folder
         out_files = self.separator.separate(tmp_file)
@@ -598,7 +634,7 @@ class EnsembleDemucsMDXMusicSeparationModel:
             if out_label in skip_transforms:
                 continue
             if self._should_apply_transform(simulated_name, transform_flag):
-                self.separator.load_model(model_file)
+                self._load_model(model_file)
                 self.separator.output_dir = output_folder
                 self.separator.model_instance.output_dir = output_folder
                 tmp_file = write_temp_wav(current_array, sr, output_folder)
@@ -650,15 +686,21 @@ def predict_with_model(options: Dict, callback: Callable = None) -> List[str]:
         List[str]: List of output file paths.
     """
     input_dict = options["input_dict"]
-    files_data = []
-    for out_folder, input_files in input_dict.items():
-        for ip in input_files:
-            if not os.path.isfile(ip):
-                continue
-            wav_path = ensure_wav(ip)
-            loaded, sr = librosa.load(wav_path, sr=44100, mono=False)
-            base_name = os.path.splitext(os.path.basename(ip))[0]
-            files_data.append({"base_name": base_name, "mix_np": loaded, "sr": sr, "output_folder": out_folder})
+    pending = [(out_folder, ip) for out_folder, input_files in input_dict.items()
+               for ip in input_files if os.path.isfile(ip)]
+
+    # Convert one at a time: ensure_wav writes to a fixed <base>_converted.wav, so two inputs can share a target
+    wav_paths = [ensure_wav(ip) for _, ip in pending]
+
+    def _load_input(item):
+        (out_folder, ip), wav_path = item
+        loaded, sr = librosa.load(wav_path, sr=44100, mono=False)
+        base_name = os.path.splitext(os.path.basename(ip))[0]
+        return {"base_name": base_name, "mix_np": loaded, "sr": sr, "output_folder": out_folder}
+
+    # Decoding and resampling release the GIL, so the converted inputs can be loaded side by side
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        files_data = list(executor.map(_load_input, zip(pending, wav_paths)))
     if not files_data:
         return []
     model = EnsembleDemucsMDXMusicSeparationModel(options, callback)
@@ -1,20 +1,107 @@
+import functools
 import os
 import re
+import types
 from abc import abstractmethod
-from typing import List, Dict, Any, Union, Tuple, Callable
+from typing import List, Dict, Any, Union, Tuple, Callable, Optional, TYPE_CHECKING
 
 import pydantic
-import gradio as gr
-from annotated_types import Ge, Le
 
 from handlers.args import ArgHandler
 from util.data_classes import ProjectFiles
 
+if TYPE_CHECKING:
+    # Only needed for the UI type hints; the standalone api.py entry point then loads the wrappers without gradio
+    import gradio as gr
+
 if pydantic.__version__.startswith("1."):
     PYDANTIC_V2 = False
 else:
     PYDANTIC_V2 = True
 
+_CAMEL_SPLIT = re.compile(r'(?<!^)(?=[A-Z])')
+
+_AUDIO_EXTS = frozenset({".mp3", ".wav", ".flac", ".m4a", ".aac", ".ogg", ".opus"})
+_INPUT_EXTENSIONS = {
+    "audio": _AUDIO_EXTS,
+    "image": frozenset({".jpg", ".jpeg", ".png"}),
+    "video": frozenset({".mp4", ".mov", ".avi"}),
+    "text": frozenset({".txt", ".csv", ".json"}),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _extract_field_meta(field) -> Tuple[Any, Any, Any, Any]:
+    """
+    Return the (ge, le, choices, step) values stored on a pydantic field.
+    """
+    # Fields are created once per wrapper class, so each one is only scanned on its first render
+    metadata = {type(meta).__name__: meta for meta in field.metadata}
+    ge_value = getattr(metadata.get("Ge"), "ge", None)
+    le_value = getattr(metadata.get("Le"), "le", None)
+
+    extra = field.json_schema_extra or {}
+    choices = extra.get("enum")
+    step = extra.get("step")
+    return ge_value, le_value, choices, step
+
+
+@functools.lru_cache(maxsize=None)
+def build_settings_model(wrapper_cls: type) -> type:
+    """
+    Build the pydantic model used to validate a wrapper's API settings, once per wrapper class.
+    """
+    fields = {}
+    for key, value in wrapper_cls.allowed_kwargs.items():
+        field_type = value.type
+        if value.field.default == ...:
+            field_type = Optional[field_type]
+        fields[key] = (field_type, value.field)
+
+    return pydantic.create_model(f"{wrapper_cls.__name__}Settings", **fields)
+
+
+# Gradio component class for each gradio_type; anything unlisted renders as a Textbox
+_GRADIO_FACTORY = {
+    "Checkbox": "Checkbox",
+    "Text": "Textbox",
+    "Slider": "Slider",
+    "Number": "Number",
+    "Textfield": "Textbox",
+    "Dropdown": "Dropdown",
+    "File": "File",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _format_label(key: str) -> str:
+    return " ".join([word.capitalize() for word in key.split("_")])
+
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _make_field(default: Any, description: str, ge: float, le: float, step: float, min_length: int,
+                max_length: int, regex: str, choices: Tuple[Union[str, int], ...]):
+    field_kwargs = {
+        "default": default,
+        "description": description,
+        "ge": ge,
+        "le": le,
+        "min_length": min_length,
+        "max_length": max_length,
+        "step": step,
+    }
+    choices = list(choices) if choices is not None else None
+
+    if PYDANTIC_V2:
+        field_kwargs["pattern"] = regex
+        if choices:
+            field_kwargs["json_schema_extra"] = {"enum": choices}
+    else:
+        field_kwargs["regex"] = regex
+        field_kwargs["enum"] = choices
+
+    return pydantic.Field(**field_kwargs)
+
 
 class TypedInput:
     def __init__(self, default: Any = ...,
@@ -36,25 +123,14 @@ class TypedInput:
                  on_clear: Callable = None,
                  refresh: Callable = None,
                  ):
-        field_kwargs = {
-            "default": default,
-            "description": description,
-            "ge": ge,
-            "le": le,
-            "min_length": min_length,
-            "max_length": max_length,
-            "step": step,
-        }
-
-        if PYDANTIC_V2:
-            field_kwargs["pattern"] = regex
-            if choices:
-                field_kwargs["json_schema_extra"] = {"enum": choices}
-        else:
-            field_kwargs["regex"] = regex
-            field_kwargs["enum"] = choices
-
-        field = pydantic.Field(**field_kwargs)
+        # Choices are frozen to a tuple so identical inputs can share one cached Field
+        field_args = (default, description, ge, le, step, min_length, max_length, regex,
+                      tuple(choices) if choices is not None else None)
+        try:
+            field = _make_field(*field_args)
+        except TypeError:
+            # Unhashable defaults can't be cached, so build the Field directly
+            field = _make_field.__wrapped__(*field_args)
         self.type = type
         self.field = field
         self.render = render
@@ -67,6 +143,31 @@ class TypedInput:
         self.description = description
         self.gradio_type = gradio_type if gradio_type else self.pick_gradio_type()
 
+    @functools.cached_property
+    def gradio_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments (besides the label) for this input's Gradio component, built on first render.
+        """
+        default = self.field.default
+        match self.gradio_type:
+            case "Slider":
+                # Extract `ge` and `le` from metadata if they exist
+                ge_value, le_value, _, step = _extract_field_meta(self.field)
+                return {
+                    "value": default,
+                    "minimum": ge_value if ge_value is not None else 0,
+                    "maximum": le_value if le_value is not None else 100,
+                    "step": step if step is not None else 1 if isinstance(default, int) else 0.1,
+                }
+            case "Textfield":
+                return {"value": default, "lines": 3}
+            case "Dropdown":
+                return {"choices": _extract_field_meta(self.field)[2], "value": default}
+            case "File":
+                return {}
+            case _:
+                return {"value": default}
+
     def pick_gradio_type(self):
         if self.type == bool:
             return "Checkbox"
@@ -93,13 +194,16 @@ class BaseWrapper:
     default = False
     required = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Both only depend on the class definition, so settle them at import time rather than on first instantiation
+        cls.title = ' '.join(word.capitalize() for word in _CAMEL_SPLIT.sub('_', cls.__name__).split('_'))
+        cls.allowed_kwargs = types.MappingProxyType(cls.allowed_kwargs)
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(BaseWrapper, cls).__new__(cls)
-            cls._instance.arg_handler = ArgHandler()
-            class_name = cls.__name__
-            cls._instance.title = ' '.join(
-                word.capitalize() for word in re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).split('_'))
+            cls._instance.arg_handler = ArgHandler.get_instance()
 
         return cls._instance
 
@@ -133,7 +237,7 @@ class BaseWrapper:
         """
         pass
 
-    def render_options(self, container: gr.Column):
+    def render_options(self, container: "gr.Column"):
         """
         Render the options for this wrapper into the provided container.
         """
@@ -156,50 +260,13 @@ class BaseWrapper:
         """
         Create and register a Gradio element for the specified input field.
         """
+        import gradio as gr
+
         arg_key = key
-        key = " ".join([word.capitalize() for word in key.split("_")])
-
-        # Extract `ge` and `le` from metadata if they exist
-        ge_value = None
-        le_value = None
-        choices = None
-        step = None
-        for meta in value.field.metadata:
-            if isinstance(meta, Ge):
-                ge_value = meta.ge
-            elif isinstance(meta, Le):
-                le_value = meta.le
-
-        if value.field.json_schema_extra:
-            for extra in value.field.json_schema_extra:
-                if extra == "enum":
-                    choices = value.field.json_schema_extra[extra]
-                if extra == "step":
-                    step = value.field.json_schema_extra[extra]
-
-        match value.gradio_type:
-            case "Checkbox":
-                elem = gr.Checkbox(label=key, value=value.field.default)
-            case "Text":
-                elem = gr.Textbox(label=key, value=value.field.default)
-            case "Slider":
-                elem = gr.Slider(
-                    label=key,
-                    value=value.field.default,
-                    minimum=ge_value if ge_value is not None else 0,
-                    maximum=le_value if le_value is not None else 100,
-                    step=step if step is not None else 1 if isinstance(value.field.default, int) else 0.1
-                )
-            case "Number":
-                elem = gr.Number(label=key, value=value.field.default)
-            case "Textfield":
-                elem = gr.Textbox(label=key, value=value.field.default, lines=3)
-            case "Dropdown":
-                elem = gr.Dropdown(label=key, choices=choices, value=value.field.default)
-            case "File":
-                elem = gr.File(label=key)
-            case _:
-                elem = gr.Textbox(label=key, value=value.field.default)
+        key = _format_label(key)
+
+        factory = getattr(gr, _GRADIO_FACTORY.get(value.gradio_type, "Textbox"))
+        elem = factory(label=key, **value.gradio_kwargs)
 
         elem.__setattr__("elem_id", f"{class_name}_{arg_key}")
         elem.__setattr__("elem_classes", ["hintitem"])
@@ -227,36 +294,17 @@ class BaseWrapper:
         Filter the inputs to only include files that exist.
         """
         filtered_inputs, outputs = [], []
-        extensions = []
         inputs = project.last_outputs
         if not inputs:
             inputs = [project.src_file]
-        match input_type:
-            case "audio":
-                extensions = ["mp3", "wav", "flac", "m4a", "aac", "ogg", "opus"]
-            case "image":
-                extensions = ["jpg", "jpeg", "png"]
-            case "video":
-                extensions = ["mp4", "mov", "avi"]
-            case "text":
-                extensions = ["txt", "csv", "json"]
-            case _:
-                print(f"Unknown input type: {input_type}")
-                pass
-        if input_type == "audio":
-            extensions = ["mp3", "wav", "flac", "m4a", "aac", "ogg", "opus"]
-        if input_type == "image":
-            extensions = ["jpg", "jpeg", "png"]
-        if input_type == "video":
-            extensions = ["mp4", "mov", "avi"]
-        if input_type == "text":
-            extensions = ["txt", "csv", "json"]
-        if len(extensions) == 0:
+        extensions = _INPUT_EXTENSIONS.get(input_type)
+        if extensions is None:
+            print(f"Unknown input type: {input_type}")
             return filtered_inputs, outputs
 
         for input_file in inputs:
-            file, ext = os.path.splitext(input_file)
-            if ext[1:] in extensions:
+            # Compare lower-cased so e.g. "Song.WAV" is treated like "song.wav"
+            if os.path.splitext(input_file)[1].lower() in extensions:
                 filtered_inputs.append(input_file)
             else:
                 outputs.append(input_file)
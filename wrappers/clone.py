@@ -6,7 +6,7 @@ from handlers.config import model_path
 from modules.rvc.configs.config import Config
 from modules.rvc.infer.modules.vc.pipeline import VC
 from util.data_classes import ProjectFiles
-from wrappers.base_wrapper import BaseWrapper, TypedInput
+from wrappers.base_wrapper import BaseWrapper, TypedInput, build_settings_model
 
 logger = logging.getLogger(__name__)
 
@@ -315,20 +315,12 @@ class Clone(BaseWrapper):
         """
         from fastapi import File, UploadFile, HTTPException
         from fastapi.responses import FileResponse
-        from pydantic import BaseModel, create_model
+        from pydantic import BaseModel
         from typing import List, Optional
         import tempfile
         from pathlib import Path
 
-        # Create Pydantic model for settings
-        fields = {}
-        for key, value in self.allowed_kwargs.items():
-            field_type = value.type
-            if value.field.default == ...:
-                field_type = Optional[field_type]
-            fields[key] = (field_type, value.field)
-        
-        SettingsModel = create_model(f"{self.__class__.__name__}Settings", **fields)
+        SettingsModel = build_settings_model(self.__class__)
 
         @api.post("/api/v1/process/clone")
         async def process_clone(
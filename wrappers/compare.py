@@ -11,14 +11,14 @@ from util.data_classes import ProjectFiles
 from wrappers.base_wrapper import BaseWrapper
 
 
-def compute_file_hash(filepath: str, chunk_size: int = 65536) -> str:
+def compute_file_hash(filepath: str, chunk_size: int = 1 << 20) -> str:
     hasher = hashlib.md5()
+    # Reuse one buffer for every read instead of allocating a new bytes object per chunk
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
     with open(filepath, "rb") as f:
-        while True:
-            data = f.read(chunk_size)
-            if not data:
-                break
-            hasher.update(data)
+        while n := f.readinto(buffer):
+            hasher.update(view[:n])
     return hasher.hexdigest()
 
 
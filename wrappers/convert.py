@@ -1,9 +1,95 @@
+import logging
 import os
+import shutil
 import subprocess
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
 
 from util.data_classes import ProjectFiles
-from wrappers.base_wrapper import BaseWrapper, TypedInput
+from wrappers.base_wrapper import BaseWrapper, TypedInput, build_settings_model, PYDANTIC_V2
+
+logger = logging.getLogger(__name__)
+
+_NON_MP3_SKIP = (".mp3",)
+# Containers that can hold an MP3 stream; anything else is always re-encoded without probing
+_MP3_CARRIER_EXTS = frozenset({".m4a", ".mka", ".mkv", ".mp4"})
+
+
+def _save_upload(src, dst: str) -> None:
+    """
+    Copy an uploaded file's contents to dst, in the kernel when both ends are real files.
+    """
+    with open(dst, "wb") as f:
+        try:
+            size = os.fstat(src.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(f.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile on this platform, or the upload isn't backed by a file descriptor
+            src.seek(0)
+            f.seek(0)
+            f.truncate()
+            shutil.copyfileobj(src, f, 1 << 20)
+
+
+def _probe_audio_stream(input_file: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Return the codec name and bit rate of the first audio stream, or (None, None) if it can't be probed.
+    """
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "a:0", "-show_entries", "stream=codec_name,bit_rate",
+         "-of", "csv=p=0", input_file],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None, None
+    codec_name, _, bit_rate = result.stdout.strip().splitlines()[0].partition(",")
+    return codec_name, int(bit_rate) if bit_rate.isdigit() else None
+
+
+def _parse_bitrate(bitrate: str) -> Optional[int]:
+    """
+    Return the bitrate in bits per second, or None if it isn't a form we recognise (e.g. "320k", "1M").
+    """
+    value = str(bitrate).strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        value, multiplier = value[:-1], 1000
+    elif value.endswith("m"):
+        value, multiplier = value[:-1], 1000000
+    try:
+        return int(float(value) * multiplier)
+    except ValueError:
+        return None
+
+
+def _convert_to_mp3(input_file: str, output_file: str, bitrate: str) -> str:
+    # An MP3 stream already at the requested bitrate only needs a container change, not a re-encode
+    codec_name, bit_rate = None, None
+    if os.path.splitext(input_file)[1].lower() in _MP3_CARRIER_EXTS:
+        codec_name, bit_rate = _probe_audio_stream(input_file)
+    target_bit_rate = _parse_bitrate(bitrate) if codec_name == "mp3" else None
+    if target_bit_rate is not None and bit_rate == target_bit_rate:
+        codec_args = ["-map", "0:a", "-c:a", "copy"]
+    else:
+        codec_args = ["-c:a", "libmp3lame", "-b:a", bitrate]
+    # Convert to MP3; an argv list runs ffmpeg directly, without an intermediate shell or quoting issues
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", input_file, *codec_args, output_file],
+        stdout=subprocess.DEVNULL,  # Suppress stdout
+        stderr=subprocess.PIPE,  # With -loglevel error this only ever holds the actual error messages
+        text=True,
+        errors="replace",  # Error lines can echo file names that aren't valid in the locale encoding
+    )
+    if result.returncode != 0:
+        logger.error(f"ffmpeg failed to convert {input_file}: {result.stderr.strip()}")
+    return output_file
 
 
 class Convert(BaseWrapper):
@@ -32,20 +118,15 @@ class Convert(BaseWrapper):
             The registered endpoint route
         """
         from fastapi import File, UploadFile, HTTPException
-        from fastapi.responses import FileResponse
-        from pydantic import BaseModel, create_model
+        from fastapi.concurrency import run_in_threadpool
+        from fastapi.responses import Response
+        from pydantic import BaseModel
         from pathlib import Path
+        import io
         import tempfile
+        import zipfile
 
-        # Create Pydantic model for settings
-        fields = {}
-        for key, value in self.allowed_kwargs.items():
-            field_type = value.type
-            if value.field.default == ...:
-                field_type = Optional[field_type]
-            fields[key] = (field_type, value.field)
-        
-        SettingsModel = create_model(f"{self.__class__.__name__}Settings", **fields)
+        SettingsModel = build_settings_model(self.__class__)
 
         @api.post("/api/v1/process/convert")
         async def process_convert(
@@ -60,7 +141,7 @@ class Convert(BaseWrapper):
                 settings: Conversion settings including bitrate
                 
             Returns:
-                List of converted audio files
+                Zip archive of the converted audio files
             """
             try:
                 with tempfile.TemporaryDirectory() as temp_dir:
@@ -68,24 +149,43 @@ class Convert(BaseWrapper):
                     input_files = []
                     for file in files:
                         file_path = Path(temp_dir) / file.filename
-                        with file_path.open("wb") as f:
-                            content = await file.read()
-                            f.write(content)
+                        # Copy off the event loop, so an upload never has to fit in memory or stall other requests
+                        await run_in_threadpool(_save_upload, file.file, str(file_path))
                         input_files.append(ProjectFiles(str(file_path)))
                     
                     # Process files
-                    settings_dict = settings.dict() if settings else {}
+                    # Only forward what the client actually set; process_audio falls back to the declared defaults
+                    if settings is None:
+                        settings_dict = {}
+                    elif PYDANTIC_V2:
+                        settings_dict = settings.model_dump(exclude_unset=True) if settings.model_fields_set else {}
+                    else:
+                        settings_dict = settings.dict(exclude_unset=True) if settings.__fields_set__ else {}
                     processed_files = self.process_audio(input_files, **settings_dict)
                     
-                    # Return processed files
-                    output_files = []
-                    for project in processed_files:
-                        for output in project.last_outputs:
-                            output_path = Path(output)
-                            if output_path.exists():
-                                output_files.append(FileResponse(output))
-                    
-                    return output_files
+                    # Return processed files as a single archive; MP3s are already compressed, so store them as-is
+                    buffer = io.BytesIO()
+                    used_names = set()
+                    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+                        for project in processed_files:
+                            for output in project.last_outputs:
+                                if os.path.exists(output):
+                                    # Outputs from different projects can share a file name
+                                    file_name, ext = os.path.splitext(os.path.basename(output))
+                                    arcname = f"{file_name}{ext}"
+                                    suffix = 1
+                                    while arcname.lower() in used_names:
+                                        arcname = f"{file_name}_{suffix}{ext}"
+                                        suffix += 1
+                                    used_names.add(arcname.lower())
+                                    zf.write(output, arcname=arcname)
+
+                    # The archive is already complete in memory, so send it as one body
+                    return Response(
+                        buffer.getvalue(),
+                        media_type="application/zip",
+                        headers={"Content-Disposition": 'attachment; filename="converted.zip"'},
+                    )
                     
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
@@ -93,34 +193,41 @@ class Convert(BaseWrapper):
         return process_convert
 
     def process_audio(self, inputs: List[ProjectFiles], callback=None, **kwargs: Dict[str, Any]) -> List[ProjectFiles]:
-        bitrate = kwargs.get("bitrate", "192k")  # Default bitrate
+        bitrate = kwargs.get("bitrate", self.allowed_kwargs["bitrate"].field.default)
 
         # Filter inputs and initialize progress tracking
         pj_outputs = []
         for project in inputs:
-            outputs = []
             input_files, _ = self.filter_inputs(project, "audio")
-            non_mp3_inputs = [i for i in input_files if not i.endswith(".mp3")]
+            non_mp3_inputs = [i for i in input_files if not i.lower().endswith(_NON_MP3_SKIP)]
             if not non_mp3_inputs:
                 continue
             output_folder = os.path.join(project.project_dir)
             os.makedirs(output_folder, exist_ok=True)
-            for idx, input_file in enumerate(non_mp3_inputs):
-                if callback is not None:
-                    pct_done = int((idx + 1) / len(non_mp3_inputs))
-                    callback(pct_done, f"Converting {os.path.basename(input_file)}", len(non_mp3_inputs))
-                file_name, ext = os.path.splitext(os.path.basename(input_file))
-                output_file = os.path.join(output_folder, f"{file_name}.mp3")
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                # Convert to MP3
-                subprocess.run(
-                    f'ffmpeg -i "{input_file}" -b:a {bitrate} "{output_file}"',
-                    shell=True,
-                    stdout=subprocess.DEVNULL,  # Suppress stdout
-                    stderr=subprocess.PIPE,  # Redirect stderr to capture errors (optional)
-                )
-                outputs.append(output_file)
+            outputs = []
+            n_inputs = len(non_mp3_inputs)
+            # Each file is its own ffmpeg process, so the pool threads only wait on them while they encode in parallel
+            max_workers = min(os.cpu_count() or 1, n_inputs)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                used_outputs = set()
+                for input_file in non_mp3_inputs:
+                    base = os.path.basename(input_file)
+                    file_name, ext = os.path.splitext(base)
+                    # e.g. song.wav and song.flac would both map to song.mp3 and be written concurrently
+                    output_file = os.path.join(output_folder, f"{file_name}.mp3")
+                    suffix = 1
+                    while os.path.normcase(output_file) in used_outputs:
+                        output_file = os.path.join(output_folder, f"{file_name}_{suffix}.mp3")
+                        suffix += 1
+                    used_outputs.add(os.path.normcase(output_file))
+                    outputs.append(output_file)
+                    futures[executor.submit(_convert_to_mp3, input_file, output_file, bitrate)] = base
+                for idx, future in enumerate(as_completed(futures)):
+                    future.result()
+                    if callback is not None:
+                        # Callbacks take (step, message, total), so report the completed count rather than a fraction
+                        callback(idx + 1, f"Converted {futures[future]}", n_inputs)
             project.add_output("converted", outputs)
             pj_outputs.append(project)
         return pj_outputs
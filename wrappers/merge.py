@@ -7,7 +7,7 @@ from pydub import AudioSegment, effects
 from handlers.reverb import apply_reverb
 from util.audio_track import shift_pitch
 from util.data_classes import ProjectFiles
-from wrappers.base_wrapper import BaseWrapper, TypedInput
+from wrappers.base_wrapper import BaseWrapper, TypedInput, build_settings_model
 
 logger = logging.getLogger(__name__)
 
@@ -176,20 +176,12 @@ class Merge(BaseWrapper):
         """
         from fastapi import File, UploadFile, HTTPException
         from fastapi.responses import FileResponse
-        from pydantic import BaseModel, create_model
+        from pydantic import BaseModel
         from typing import List, Optional
         import tempfile
         from pathlib import Path
 
-        # Create Pydantic model for settings
-        fields = {}
-        for key, value in self.allowed_kwargs.items():
-            field_type = value.type
-            if value.field.default == ...:
-                field_type = Optional[field_type]
-            fields[key] = (field_type, value.field)
-        
-        SettingsModel = create_model(f"{self.__class__.__name__}Settings", **fields)
+        SettingsModel = build_settings_model(self.__class__)
 
         @api.post("/api/v1/process/merge")
         async def process_merge(
@@ -1,14 +1,33 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, List, Dict
 
-import matchering as mg
-
 from util.data_classes import ProjectFiles
-from wrappers.base_wrapper import BaseWrapper, TypedInput
+from wrappers.base_wrapper import BaseWrapper, TypedInput, build_settings_model
 import logging
 logger = logging.getLogger(__name__)
 
 
+def _remaster_one(input_file: str, reference_file: str, output_folder: str) -> str:
+    # Matchering pulls in its whole DSP stack, so only import it once a track is actually remastered
+    import matchering as mg
+
+    base = os.path.basename(input_file)
+    inputs_name, inputs_ext = os.path.splitext(base)
+    output_file = os.path.join(output_folder, f"{inputs_name}(Remastered){inputs_ext}")
+    mg.process(
+        # The track you want to master
+        target=input_file,
+        # Some "wet" reference track
+        reference=reference_file,
+        # Where and how to save your results
+        results=[
+            mg.pcm24(output_file),
+        ],
+    )
+    return output_file
+
+
 class Remaster(BaseWrapper):
     title = "Remaster"
     description = "Remaster audio files using a reference track. Uses Matchering."
@@ -37,32 +56,26 @@ class Remaster(BaseWrapper):
         callback_step = 0
         pj_outputs = []
         try:
-            for project in inputs:
-                outputs = []
-                if use_source_track_as_reference:
-                    reference_file = project.src_file
-                output_folder = os.path.join(project.project_dir, "remastered")
-                os.makedirs(output_folder, exist_ok=True)
-                input_files, _ = self.filter_inputs(project, "audio")
-                for input_file in input_files:
-                    logger.info(f"Remastering {input_file}")
-                    callback(callback_step, f"Remastering {input_file}", len(inputs))
-                    inputs_name, inputs_ext = os.path.splitext(os.path.basename(input_file))
-                    output_file = os.path.join(output_folder, f"{inputs_name}(Remastered){inputs_ext}")
-                    mg.process(
-                        # The track you want to master
-                        target=input_file,
-                        # Some "wet" reference track
-                        reference=reference_file,
-                        # Where and how to save your results
-                        results=[
-                            mg.pcm24(output_file),
-                        ],
-                    )
-                    outputs.append(output_file)
-                    callback_step += 1
-                project.add_output("remaster", outputs)
-                pj_outputs.append(project)
+            # Matchering spends its time in numpy/scipy, which release the GIL; it also threads internally, so keep the pool small
+            with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+                for project in inputs:
+                    if use_source_track_as_reference:
+                        reference_file = project.src_file
+                    output_folder = os.path.join(project.project_dir, "remastered")
+                    os.makedirs(output_folder, exist_ok=True)
+                    input_files, _ = self.filter_inputs(project, "audio")
+                    futures = {}
+                    for input_file in input_files:
+                        logger.info(f"Remastering {input_file}")
+                        futures[executor.submit(_remaster_one, input_file, reference_file, output_folder)] = input_file
+                    for future in as_completed(futures):
+                        future.result()
+                        callback_step += 1
+                        callback(callback_step, f"Remastered {futures[future]}", len(inputs))
+                    # Keep outputs in input order rather than completion order
+                    outputs = [future.result() for future in futures]
+                    project.add_output("remaster", outputs)
+                    pj_outputs.append(project)
         except Exception as e:
             logger.error(f"Error remastering audio: {e}")
             if callback is not None:
@@ -82,20 +95,12 @@ class Remaster(BaseWrapper):
         """
         from fastapi import File, UploadFile, HTTPException
         from fastapi.responses import FileResponse
-        from pydantic import BaseModel, create_model
+        from pydantic import BaseModel
         from typing import List, Optional
         import tempfile
         from pathlib import Path
 
-        # Create Pydantic model for settings
-        fields = {}
-        for key, value in self.allowed_kwargs.items():
-            field_type = value.type
-            if value.field.default == ...:
-                field_type = Optional[field_type]
-            fields[key] = (field_type, value.field)
-        
-        SettingsModel = create_model(f"{self.__class__.__name__}Settings", **fields)
+        SettingsModel = build_settings_model(self.__class__)
 
         @api.post("/api/v1/process/remaster")
         async def process_remaster(
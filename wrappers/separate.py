@@ -9,7 +9,7 @@ import logging
 from handlers.config import output_path
 from modules.separator.stem_separator import separate_music
 from util.data_classes import ProjectFiles
-from wrappers.base_wrapper import BaseWrapper, TypedInput
+from wrappers.base_wrapper import BaseWrapper, TypedInput, build_settings_model
 
 logger = logging.getLogger(__name__)
 
@@ -131,20 +131,12 @@ class Separate(BaseWrapper):
         """
         from fastapi import File, UploadFile, HTTPException
         from fastapi.responses import FileResponse
-        from pydantic import BaseModel, create_model
+        from pydantic import BaseModel
         from typing import List, Optional
         import tempfile
         from pathlib import Path
 
-        # Create Pydantic model for settings
-        fields = {}
-        for key, value in self.allowed_kwargs.items():
-            field_type = value.type
-            if value.field.default == ...:
-                field_type = Optional[field_type]
-            fields[key] = (field_type, value.field)
-        
-        SettingsModel = create_model(f"{self.__class__.__name__}Settings", **fields)
+        SettingsModel = build_settings_model(self.__class__)
 
         @api.post("/api/v1/process/separate")
         async def process_separate(
@@ -352,10 +344,13 @@ class Separate(BaseWrapper):
         Useful for verifying the file hasn't changed between runs.
         """
         sha256_hash = hashlib.sha256()
+        # Read into one reusable 1 MiB buffer so large stems take few trips into the hash code
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
         try:
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(65536), b""):
-                    sha256_hash.update(chunk)
+                while n := f.readinto(buffer):
+                    sha256_hash.update(view[:n])
         except Exception as e:
             logger.warning(f"Error hashing file {filepath}: {e}")
         return sha256_hash.hexdigest()
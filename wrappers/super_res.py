@@ -1,3 +1,4 @@
+import functools
 import gc
 import logging
 import os
@@ -29,22 +30,31 @@ def match_array_shapes(array_1: np.ndarray, array_2: np.ndarray):
         if array_1.shape[0] > array_2.shape[0]:
             array_1 = array_1[:array_2.shape[0]]
         elif array_1.shape[0] < array_2.shape[0]:
-            array_1 = np.pad(array_1, (array_2.shape[0] - array_1.shape[0], 0), 'constant', constant_values=0)
+            # Zero-fill a buffer of the target size and copy in, rather than going through np.pad
+            padded = np.zeros(array_2.shape[0], dtype=array_1.dtype)
+            padded[array_2.shape[0] - array_1.shape[0]:] = array_1
+            array_1 = padded
     else:
         if array_1.shape[1] > array_2.shape[1]:
             array_1 = array_1[:, :array_2.shape[1]]
         elif array_1.shape[1] < array_2.shape[1]:
-            padding = array_2.shape[1] - array_1.shape[1]
-            array_1 = np.pad(array_1, ((0, 0), (0, padding)), 'constant', constant_values=0)
+            padded = np.zeros((array_1.shape[0], array_2.shape[1]), dtype=array_1.dtype)
+            padded[:, :array_1.shape[1]] = array_1
+            array_1 = padded
     return array_1
 
 
-def lr_filter(audio, cutoff, filter_type, order=12, sr=48000):
-    audio = audio.T
+@functools.lru_cache(maxsize=64)
+def _butter_sos(cutoff, filter_type, order, sr):
+    # Design straight into second-order sections; the coefficients only depend on the arguments
     nyquist = 0.5 * sr
     normal_cutoff = cutoff / nyquist
-    b, a = signal.butter(order // 2, normal_cutoff, btype=filter_type, analog=False)
-    sos = signal.tf2sos(b, a)
+    return signal.butter(order // 2, normal_cutoff, btype=filter_type, analog=False, output="sos")
+
+
+def lr_filter(audio, cutoff, filter_type, order=12, sr=48000):
+    audio = audio.T
+    sos = _butter_sos(cutoff, filter_type, order, sr)
     filtered_audio = signal.sosfiltfilt(sos, audio)
     return filtered_audio.T
 